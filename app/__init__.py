@@ -6,39 +6,103 @@ Modules:
     - app.chat: Defines the main entry point for the application.
     - app.utils.logger: Defines the logger for the application.
     - app.agents.coordinator: Defines the coordinator agent.
+    - app.agents.llm: Defines the LLM shared by the agents.
     - app.agents.tools: Defines the tools for the coordinator agent.
     - app.agents.sub_agents: Defines the sub agents for the coordinator agent.
 
 Functions:
+    - get_firebase_credentials: Parses the Firebase credentials once per process.
+    - initialize_firebase: Initializes the Firebase Admin SDK.
+    - warm_up_llm: Builds the shared LLM API client ahead of the first request.
     - lifespan: Method use to initialize the application.
+    - merged_lifespan: Runs the Chainlit startup and shutdown hooks along with the application lifespan.
     - health_check: Health check endpoint.
     - agent_info: Agent info endpoint.
 
 Variables:
     - BASE_DIR: Base directory of the application.
     - AGENTS_BASE_DIR: Agents base directory of the application.
+    - HEALTH_CHECK_CONTENT: Serialized health check response.
+    - AGENT_INFO_CONTENT: Serialized agent info response.
     - logger: Logger instance.
     - api: FastAPI application.
     - mount_chainlit: Mounts the Chainlit application.
     - get_fast_api_app: Gets the FastAPI application.
 """
-import json
+import asyncio
 import os
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
 
-import firebase_admin
+import orjson
 from chainlit.utils import mount_chainlit
-from fastapi import FastAPI
-from firebase_admin import credentials
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
 from google.adk.cli.fast_api import get_fast_api_app
+from google.adk.models import Gemini
 
 from .agents import coordinator
-from .utils.logger import Logger
+from .utils.logger import get_logger
+from .utils.service_factory import SESSION_BACKEND
 
-logger = Logger(__name__)
+logger = get_logger(__name__)
 
-BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-AGENTS_BASE_DIR = os.path.abspath(os.path.join(BASE_DIR, 'agents'))
+_BASE_PATH = Path(__file__).resolve().parent
+BASE_DIR = str(_BASE_PATH)
+AGENTS_BASE_DIR = str(_BASE_PATH / 'agents')
+
+# Both payloads only depend on import time data, so they're serialized once
+HEALTH_CHECK_CONTENT = orjson.dumps({'status': 'ok'})
+AGENT_INFO_CONTENT = orjson.dumps({
+    "name": coordinator.name,
+    "description": coordinator.description,
+    "model": coordinator.canonical_model.model,
+    "tools": [tool.__name__ for tool in coordinator.tools]
+})
+
+@lru_cache(maxsize=1)
+def get_firebase_credentials(raw_credentials: str):
+    """Parses the Firebase credentials once per process.
+
+    Args:
+        raw_credentials (str): The service account JSON string.
+
+    Returns:
+        credentials.Certificate: The Firebase credentials.
+    """
+    from firebase_admin import credentials
+
+    return credentials.Certificate(orjson.loads(raw_credentials))
+
+def initialize_firebase():
+    """Initializes the Firebase Admin SDK with the FIREBASE_CREDENTIALS service account.
+
+    Raises:
+        ValueError: If the FIREBASE_CREDENTIALS environment variable is not set.
+    """
+    # Only imported when the Firebase backend is selected
+    import firebase_admin
+
+    firebase_credentials_json = os.getenv("FIREBASE_CREDENTIALS")
+    if not firebase_credentials_json:
+        raise ValueError("FIREBASE_CREDENTIALS environment variable not set.")
+
+    # Avoid re-initializing the default app on forked workers
+    if not firebase_admin._apps:
+        firebase_admin.initialize_app(get_firebase_credentials(firebase_credentials_json))
+
+def warm_up_llm():
+    """Builds the shared LLM API client ahead of the first request.
+
+    The client is lazily built by the LLM on its first call, which resolves
+    the credentials and loads the google-genai transport. Doing it at boot
+    keeps that cost out of the first user message.
+    """
+    llm = coordinator.canonical_model
+    # api_client is a cached property: reading it builds the client
+    if isinstance(llm, Gemini):
+        _ = llm.api_client
 
 @asynccontextmanager
 async def lifespan(api: FastAPI):
@@ -48,48 +112,72 @@ async def lifespan(api: FastAPI):
         api (FastAPI): The FastAPI application.
     """
     logger.info("Initializing application...")
+    if SESSION_BACKEND == "firebase":
+        try:
+            initialize_firebase()
+            logger.info("Firebase initialized and session service placeholder set.")
+        except Exception as e:
+            logger.error(f"Database session service initialized failed: {e}")
+
     try:
-        # Initialize Firebase Admin SDK
-        firebase_credentials_json = os.getenv("FIREBASE_CREDENTIALS")
-        if not firebase_credentials_json:
-            raise ValueError("FIREBASE_CREDENTIALS environment variable not set.")
-        
-        cred_dict = json.loads(firebase_credentials_json)
-        cred = credentials.Certificate(cred_dict)
-        firebase_admin.initialize_app(cred)
-        logger.info("Firebase initialized and session service placeholder set.")
+        await asyncio.to_thread(warm_up_llm)
     except Exception as e:
-        logger.error(f"Database session service initialized failed: {e}")
+        logger.warning(f"LLM client warm up failed: {e}")
     
     yield
     logger.info("Application shutting down...")
     logger.info("Application shut down successfully.")
 
+@asynccontextmanager
+async def merged_lifespan(api: FastAPI):
+    """Runs the Chainlit startup and shutdown hooks along with the application lifespan.
+
+    Starlette does not run the lifespan of mounted sub-applications, so the
+    Chainlit hooks are called here. Chainlit's own lifespan isn't entered: it
+    ends with os._exit, which would skip the ADK runners cleanup, the trace
+    exporter flush and the server graceful shutdown.
+
+    Args:
+        api (FastAPI): The FastAPI application.
+    """
+    # The Chainlit hooks are only registered after mount_chainlit runs
+    from chainlit.config import config as chainlit_config
+
+    if chainlit_config.code.on_app_startup:
+        await chainlit_config.code.on_app_startup()
+    try:
+        async with lifespan(api):
+            yield
+    finally:
+        if chainlit_config.code.on_app_shutdown:
+            await chainlit_config.code.on_app_shutdown()
+
 api: FastAPI = get_fast_api_app(
     agents_dir=AGENTS_BASE_DIR,
     allow_origins=["*"],
-    lifespan=lifespan,
+    lifespan=merged_lifespan,
     trace_to_cloud=True,
     web=False
 )
+# Routes declared from here on serialize their payloads with orjson
+api.router.default_response_class = ORJSONResponse
 
-@api.get('/healthcheck')
+# Liveness probes often use HEAD instead of GET
+@api.api_route('/healthcheck', methods=['GET', 'HEAD'])
 async def health_check():
     """Health check endpoint."""
-    return {'status': 'ok'}
+    return Response(content=HEALTH_CHECK_CONTENT, media_type="application/json")
 
 @api.get('/agent-info')
 async def agent_info():
     """Agent info endpoint.
     
     Returns:
-        dict: The agent information.
+        Response: The agent information.
     """
-    return {
-        "name": coordinator.name,
-        "description": coordinator.description,
-        "model": coordinator.model,
-        "tools": [tool.__name__ for tool in coordinator.tools]
-    }
+    return Response(content=AGENT_INFO_CONTENT, media_type="application/json")
 
+# Chainlit is mounted at the root as a catch-all, so it must stay the last
+# route: Starlette matches routes in registration order, which keeps the
+# endpoints above (and the probes hitting them) out of Chainlit's stack.
 mount_chainlit(app=api, target="app/chat.py", path="/")
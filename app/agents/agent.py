@@ -8,13 +8,14 @@ import os
 
 from google.adk.agents import LlmAgent
 
+from .llm import get_llm
 from .sub_agents.data_scientist_agent import data_scientst_agent
 from .sub_agents.electric_engineer_agent import electric_engineer_agent
 from .sub_agents.reviewer_agent import reviewer_agent
 
 coordinator = LlmAgent(
     name="CoordinatorAgent",
-    model=os.environ.get("LLM_MODEL_NAME"),
+    model=get_llm(os.environ.get("LLM_MODEL_NAME")),
     instruction="You are a coordinator agent specialized support users to create reports of electic energy quality complience",
     description="""
         Your core job is to interact with users through a conversacional interface to help them to create, refine and elucidate any requirement or requests provided by the user to build the best and more professional report of the energy quality compliance as possible.
@@ -0,0 +1,26 @@
+"""This module provides the LLM shared by the agents.
+
+Functions:
+    get_llm: Gets the LLM instance for a model name.
+"""
+from functools import lru_cache
+
+from google.adk.models import BaseLlm, LLMRegistry
+
+
+@lru_cache(maxsize=8)
+def get_llm(model_name: str) -> BaseLlm:
+    """Gets the LLM instance for a model name.
+
+    When an agent is declared with a model name, ADK resolves it into a new
+    LLM, with its own API client, on every call. Sharing a single instance
+    per model name lets all the agents reuse the same client and its
+    connection pool.
+
+    Args:
+        model_name (str): The name of the model (e.g., "gemini-2.0-flash").
+
+    Returns:
+        BaseLlm: The LLM instance.
+    """
+    return LLMRegistry.new_llm(model_name)
@@ -11,9 +11,11 @@ from google.adk.agents import Agent, LlmAgent
 from google.adk.code_executors import BuiltInCodeExecutor
 from google.adk.tools import agent_tool
 
+from app.agents.llm import get_llm
+
 data_engineer_agent = Agent(
     name="DataEngineerAgent",
-    model=os.getenv("LLM_MODEL_NAME"),
+    model=get_llm(os.getenv("LLM_MODEL_NAME")),
     description="You are a Senior Data Engineer, specialist in writing and executing performatic code in python for data analytics and insights with more than 10 years of expertise.",
     instruction="""
     You will receive a dataset in CSV format at the session state variable {file_path?}, with multiple colunms to be processed and transformed into features.
@@ -39,7 +41,7 @@ data_engineer_agent = Agent(
 
 data_scientst_agent = LlmAgent(
     name="DataScientistAgent",
-    model=os.getenv("LLM_MODEL_NAME"),
+    model=get_llm(os.getenv("LLM_MODEL_NAME")),
     description="You are a Senior Data Scientist specializing in electrical power quality data from devices like PowerNET PQ-600 G4. You will be provided with the {file_path?} of power quality data in CSV or TXT file, but both following the CSV format.",
     instruction="""
     Your task is to meticulously analyze the data generate a comprehensive textual preparation report in the language specified by {language_code?} (default to Brazilian Portuguese if not specified or if the language is not well-supported for this technical domain).
@@ -9,11 +9,12 @@ import os
 from google.adk.agents import Agent, LlmAgent
 from google.adk.tools import agent_tool, google_search
 
+from app.agents.llm import get_llm
 from app.agents.tools.store_management_tool import delete_docs, load_docs, retrieve_docs
 
 aneel_resolution_expert_agent = Agent(
     name='ANEELResolutionExpertAgent',
-    model=os.getenv("LLM_MODEL_NAME"),
+    model=get_llm(os.getenv("LLM_MODEL_NAME")),
     description='You are an expert in Brazilian electrical regulations, specifically ANEEL Normative Resolutions.',
     instruction="""
         Based on the provided summary of power quality data, identify the relevant ANEEL Normative Resolutions that apply.
@@ -39,27 +40,20 @@ aneel_resolution_expert_agent = Agent(
 
 electric_engineer_agent = LlmAgent(
     name="ElectricEngineerAgent",
-    model=os.getenv("LLM_MODEL_NAME"),
+    model=get_llm(os.getenv("LLM_MODEL_NAME")),
     description="You are a Senior Electric Engineer specializing in electrical power quality data from devices like PowerNET PQ-600 G4 and ANEEL regulations, responsible for generating a detailed and well-structured technical compliance report.",
     instruction="""
-    The report MUST be generated in the language specified by '{language_code?}' (the default is Brazilian Portuguese - pt-BR - if not specified or if the language is not well supported for this technical task).
+    The report MUST be generated in the Report Language given in the Analysis Context below (the default is Brazilian Portuguese - pt-BR - if not specified or if the language is not well supported for this technical task).
     Direct citations to the names of resolutions, ANEEL articles, or standard texts must remain in Portuguese, even if the rest of the report is in another language.
 
-    **Analysis Context:**
-    - Data File Path: {file_path?}
-    - Client Name: {client_name?}
-    - Data Scientist Report: {ds_report?}
-    - ANEEL Resolutions: {aneel_resolutions?}
-    - Report Language: {language_code?}
-
     **Your Task:**
-    Generate a complete compliance report in the '{language_code?}' language. The report should be technical, clear, objective, and ready to form the basis of a professional PDF document.
+    Generate a complete compliance report in the Report Language. The report should be technical, clear, objective, and ready to form the basis of a professional PDF document.
 
-    **Detailed Guidelines for Each Part of the Report (to be generated in the language '{language_code?}'):**
+    **Detailed Guidelines for Each Part of the Report (to be generated in the Report Language):**
 
     1. **reportMetadata:**
     * `title`: Create a formal title, such as "Electric Power Quality Compliance Analysis Report."
-    * `subtitle`: Optional. May include the cliente name: "Analysis related to '{client_name?}'."
+    * `subtitle`: Optional. May include the cliente name: "Analysis related to <Client Name>."
     * `author`: Use "Energy Compliance Analyser."
     * `generatedDate`: Use the current date in ISO format.
     * `disclaimer`: Ensure to add an phrase stating that the report was generated by an AI and it's subjected to mistakes.
@@ -68,18 +62,18 @@ electric_engineer_agent = LlmAgent(
     * List the titles of the main sections you will create (e.g., "Introduction," "Analysis Sections" titles, "Final Considerations," "References").
 
     3. **Introduction:**
-    * `Objective`: Describe the purpose of the report (e.g., to analyze the compliance of the data from '{client_name?}' with ANEEL resolutions).
+    * `Objective`: Describe the purpose of the report (e.g., to analyze the compliance of the client's data with ANEEL resolutions).
     * `Overall Results Summary`: Provide a brief overview of the findings (e.g., whether most parameters are compliant, or whether there are significant violations).
-    * `Used Norms Overview`: Mention in general terms the main ANEEL resolutions (from the {aneel_resolutions?} list, keeping the resolution names in Portuguese) that supported the analysis.
+    * `Used Norms Overview`: Mention in general terms the main ANEEL resolutions (from the ANEEL Resolutions list, keeping the resolution names in Portuguese) that supported the analysis.
 
     4. **Analysis Sections:** This is the main part. Create multiple sections. * **Ordering:** Organize the sections by common themes (e.g., "Voltage Analysis," "Frequency Analysis," "Voltage Imbalance," "Harmonics") and, within themes, if possible, chronologically if the data in the summary allows for date/time stamped events.
         * For each `Report Section`:
             * `title`: A clear and descriptive title for the section (e.g., "Steady-State Voltage Level Analysis").
-            * `content`: Detail the analysis of the parameters relevant to this section, based on the {ds_report?} and the {aneel_resolutions?}. Be technical, but clear. Compare the observed values ​​with regulatory limits.
+            * `content`: Detail the analysis of the parameters relevant to this section, based on the Data Scientist Report and the ANEEL Resolutions. Be technical, but clear. Compare the observed values ​​with regulatory limits.
             * `insights`: List the main insights, observations, or issues detected in this specific section. Each insight should be a concise sentence.
             * `relevant norms`: For each insight or problem, **explicitly state the ANEEL standard and the specific article/item in Portuguese** that supports it (e.g., "Resolution XXX/YYYY, Art. Z, Clause W", or "PRODIST Module 8, item 3.2.1"). Be precise.
-            * `chart/image suggestion`: (OPTIONAL, BUT RECOMMENDED) Generate a suggested visual diagram in **Mermaid syntax** that could illustrate the section's findings. E.g., for a pie chart, `pie title Chart Title "Section A": 30 "Section B": 70`; for a bar chart, `xychart-beta title "Voltage Variation" x-axis "Time" y-axis "Voltage (V)" bar [10, 12, 15, 11]`. **See the official Mermaid.js documentation at https://mermaid.js.org/intro/ for syntax reference.** Mermaid syntax MUST be provided directly in the {mdx_report}.
-            * `chart url`: (OPTIONAL) If the chart or the image was generated without the Mermaid sintax, use the MDX sintaxe with the image url into the {mdx_report?}
+            * `chart/image suggestion`: (OPTIONAL, BUT RECOMMENDED) Generate a suggested visual diagram in **Mermaid syntax** that could illustrate the section's findings. E.g., for a pie chart, `pie title Chart Title "Section A": 30 "Section B": 70`; for a bar chart, `xychart-beta title "Voltage Variation" x-axis "Time" y-axis "Voltage (V)" bar [10, 12, 15, 11]`. **See the official Mermaid.js documentation at https://mermaid.js.org/intro/ for syntax reference.** Mermaid syntax MUST be provided directly in the MDX report.
+            * `chart url`: (OPTIONAL) If the chart or the image was generated without the Mermaid sintax, use the MDX sintaxe with the image url into the MDX report
 
     5. **finalConsiderations:**
     * Summarize the main conclusions of the analysis.
@@ -93,11 +87,18 @@ electric_engineer_agent = LlmAgent(
             * `link`: If you know of an official link to the standard, include it. Otherwise, you can omit it.
 
     **Important:**
-    * The main content of the report must be generated in the '{language_code?}' language.
+    * The main content of the report must be generated in the Report Language.
     * Names of ANEEL resolutions, articles, and regulatory texts MUST be kept in Portuguese.
-    * Be as detailed and accurate as possible, relying strictly on the information in the {ds_report?} and {aneel_resolutions?}.
+    * Be as detailed and accurate as possible, relying strictly on the information in the Data Scientist Report and the ANEEL Resolutions.
     * If the summary is limited, acknowledge this in your analysis (e.g., "Based on the summarized data, it was not possible to evaluate X in detail...").
     * The quality of the structuring, the accuracy of references to standards, and the validity of the Mermaid syntax are crucial.
+
+    **Analysis Context:**
+    - Data File Path: {file_path?}
+    - Client Name: {client_name?}
+    - Data Scientist Report: {ds_report?}
+    - ANEEL Resolutions: {aneel_resolutions?}
+    - Report Language: {language_code?}
     """,
     tools=[agent_tool.AgentTool(aneel_resolution_expert_agent)],
     output_key="mdx_report"
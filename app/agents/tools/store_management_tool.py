@@ -1,11 +1,23 @@
 """This module define the functions to interact with the vectorstore.
 
 Functions:
+    get_embedding: Get the embedding model used by the vectorstore.
+    get_vectorstore: Get the vectorstore client.
     delete_docs: Delete documents from the vectorstore by their UUIDs.
     load_docs: Load documents into the vectorstore.
     retrieve_docs: Retrieve documents from the vectorstore based on a query.
+
+Attributes:
+    RETRIEVAL_CACHE_SIZE: Maximum number of queries kept in the retrieval cache.
+    RETRIEVAL_CACHE_TTL: Seconds a cached retrieval is served before being refreshed.
+    TEXT_SPLITTER: Splitter used to chunk the documents before loading them.
 """
+import asyncio
 import os
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
 from uuid import uuid4
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -13,47 +25,134 @@ from langchain_core.documents import Document
 from langchain_google_community import BigQueryVectorStore
 from langchain_google_vertexai import VertexAIEmbeddings
 
-embedding = VertexAIEmbeddings(
-    model_name="gemini-embedding-001",
-    project=os.getenv("GOOGLE_CLOUD_PROJECT")
-)
-
-vectorstore = BigQueryVectorStore(
-    project_id=os.getenv("GOOGLE_CLOUD_PROJECT"),
-    dataset_name=os.getenv("BG_DATASET_NAME"),
-    table_name=os.getenv("BG_TABLE_NAME"),
-    location=os.getenv("GOOGLE_CLOUD_LOCATION"),
-    api_key=os.getenv("GEMINI_API_KEY"),    
-    embedding=embedding
-)
-
-def delete_docs(uuids: list[str]):
+RETRIEVAL_CACHE_SIZE = 128
+RETRIEVAL_CACHE_TTL = 300
+
+# The splitter holds no per-call state, so a single instance is shared
+TEXT_SPLITTER = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+
+# Results of recent queries with their retrieval time, cleared whenever this
+# process changes the vectorstore content. Other workers can change it too,
+# hence the TTL.
+_retrieval_cache: OrderedDict[str, tuple[float, list[Document]]] = OrderedDict()
+# Searches in flight, shared by the concurrent calls for the same query
+_pending_retrievals: dict[str, asyncio.Task] = {}
+
+
+@lru_cache(maxsize=1)
+def get_embedding() -> VertexAIEmbeddings:
+    """Get the embedding model used by the vectorstore.
+
+    The model is only built on the first call, so importing the agents
+    doesn't pay for the Vertex AI client setup.
+
+    Returns:
+        VertexAIEmbeddings: The embedding model.
+    """
+    return VertexAIEmbeddings(
+        model_name="gemini-embedding-001",
+        project=os.getenv("GOOGLE_CLOUD_PROJECT")
+    )
+
+@lru_cache(maxsize=1)
+def get_vectorstore() -> BigQueryVectorStore:
+    """Get the vectorstore client.
+
+    Built on the first tool call and reused afterwards. The construction
+    creates or fetches the BigQuery dataset and table, so the tools call it
+    from a worker thread.
+
+    Returns:
+        BigQueryVectorStore: The vectorstore client.
+    """
+    return BigQueryVectorStore(
+        project_id=os.getenv("GOOGLE_CLOUD_PROJECT"),
+        dataset_name=os.getenv("BG_DATASET_NAME"),
+        table_name=os.getenv("BG_TABLE_NAME"),
+        location=os.getenv("GOOGLE_CLOUD_LOCATION"),
+        api_key=os.getenv("GEMINI_API_KEY"),    
+        embedding=get_embedding()
+    )
+
+async def delete_docs(uuids: list[str]):
     """Delete documents from the vectorstore by their UUIDs.
 
     Args:
         uuids (List[str]): List of UUIDs to delete.
     """
-    vectorstore.delete(ids=uuids)
+    vectorstore = await asyncio.to_thread(get_vectorstore)
+    await vectorstore.adelete(ids=uuids)
+    _clear_retrieval_cache()
 
-def load_docs(documents: list[Document]):
+async def load_docs(documents: list[Document]):
     """Load documents into the vectorstore.
 
     Args:
         documents (List[Document]): List of documents to load.
     """
-    text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-    chunks = text_splitter.split_documents(documents)
-    metas = [{'uuid': str(uuid4()), 'len': len(chunk)} for chunk in chunks]
-    embs = embedding.embed(chunks)
-    vectorstore.add_texts_with_embeddings(chunks, embs=embs, metadatas=metas)
+    # The splitter overlap often yields identical chunks on repetitive
+    # documents, which are only embedded and stored once
+    chunks = {}
+    for chunk in TEXT_SPLITTER.split_documents(documents):
+        chunks.setdefault(blake2b(chunk.page_content.encode(), digest_size=16).digest(), chunk.page_content)
+    texts = list(chunks.values())
+    metas = [{'uuid': str(uuid4()), 'len': len(text)} for text in texts]
+    # Both the embedding and the BigQuery clients are blocking, from their
+    # construction onwards
+    embedding = await asyncio.to_thread(get_embedding)
+    vectorstore = await asyncio.to_thread(get_vectorstore)
+    embs = await asyncio.to_thread(embedding.embed, texts)
+    await asyncio.to_thread(vectorstore.add_texts_with_embeddings, texts, embs=embs, metadatas=metas)
+    _clear_retrieval_cache()
+
+def _clear_retrieval_cache():
+    """Drop the cached retrievals and detach the searches in flight."""
+    _retrieval_cache.clear()
+    _pending_retrievals.clear()
+
+async def _search(query: str) -> list[Document]:
+    """Search the vectorstore and cache the result.
+
+    Args:
+        query (str): Query to search for.
+
+    Returns:
+        List[Document]: List of retrieved documents.
+    """
+    vectorstore = await asyncio.to_thread(get_vectorstore)
+    docs = await vectorstore.asimilarity_search(query)
+    # A search detached by a content change must not fill the cache
+    if _pending_retrievals.get(query) is asyncio.current_task():
+        _retrieval_cache[query] = (time.monotonic(), docs)
+        if len(_retrieval_cache) > RETRIEVAL_CACHE_SIZE:
+            _retrieval_cache.popitem(last=False)
+    return docs
 
-def retrieve_docs(query: str) -> list[Document]:
+async def retrieve_docs(query: str) -> list[Document]:
     """Retrieve documents from the vectorstore based on a query.
 
+    The agents often repeat the same regulation queries, so the results of
+    the most recent ones are kept for RETRIEVAL_CACHE_TTL seconds, or until
+    documents are loaded or deleted. Concurrent calls for the same query
+    share a single search.
+
     Args:
         query (str): Query to search for.
 
     Returns:
         List[Document]: List of retrieved documents.
     """
-    return vectorstore.similarity_search(query)
\ No newline at end of file
+    cached = _retrieval_cache.get(query)
+    if cached is not None and time.monotonic() - cached[0] < RETRIEVAL_CACHE_TTL:
+        _retrieval_cache.move_to_end(query)
+        return list(cached[1])
+    task = _pending_retrievals.get(query)
+    if task is None:
+        task = asyncio.create_task(_search(query))
+        _pending_retrievals[query] = task
+        task.add_done_callback(
+            lambda done: _pending_retrievals.pop(query, None) if _pending_retrievals.get(query) is done else None
+        )
+    # A cancelled caller must not cancel the search shared with the others
+    docs = await asyncio.shield(task)
+    return list(docs)
@@ -11,6 +11,9 @@ Functions:
 
 Variables:
     - default_user_id: The default user id.
+    - STREAMING_RUN_CONFIG: Run configuration streaming the agent responses.
+    - STREAM_FLUSH_SIZE: Number of buffered characters that triggers a stream update.
+    - STREAM_FLUSH_INTERVAL: Seconds since the last stream update after which the next token is streamed right away.
     - logger: Logger instance.
     - app: Chainlit app instance.
     - coordinator: Coordinator agent instance.
@@ -22,21 +25,27 @@ Variables:
     - user: User instance.
     - user_id: User id.
 """
+import asyncio
 import os
+from functools import lru_cache
 from typing import Optional
 
 import chainlit as cl
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.runners import Runner
 from google.genai import types
 
 from app.agents import coordinator
+from app.utils.logger import get_logger
+from app.utils.service_factory import get_artifact_service, get_session_service
 
-# Import the 'api' object directly from app
-from app.utils.firebase_artifact_service import FirebaseArtifactService
-from app.utils.firebase_session_service import FirebaseSessionService
-from app.utils.logger import Logger
+# Chainlit loads this file under its path, not as part of the app package
+logger = get_logger("app.chat")
 
-logger = Logger(__name__)
+STREAMING_RUN_CONFIG = RunConfig(streaming_mode=StreamingMode.SSE)
+
+STREAM_FLUSH_SIZE = 64
+STREAM_FLUSH_INTERVAL = 0.025
 
 async def create_session(user_id: str):
     """Method use to create a new session.
@@ -51,16 +60,22 @@ async def create_session(user_id: str):
         Exception: If the session cannot be created.
     """
     try:
-        # Use the imported 'api' object to access the session service
-        session_service = FirebaseSessionService()
+        session_service = get_session_service()
         logger.info(f"Session created: {cl.context.session.id}")
-        return await session_service.create_session(user_id=user_id, session_id=cl.context.session.id)
+        return await session_service.create_session(
+            app_name=os.getenv("APP_NAME"),
+            user_id=user_id,
+            session_id=cl.context.session.id
+        )
     except Exception as e:
         logger.error(f"Error creating session: {e}")
 
 async def get_agent_session(user_id: str, session_id: str):
     """Method use to get the agent session.
 
+    The session is kept in the Chainlit user session once found or created,
+    so the following messages don't go back to the session service.
+
     Args:
         user_id (str): The user id.
         session_id (str): The session id.
@@ -68,47 +83,44 @@ async def get_agent_session(user_id: str, session_id: str):
     Returns:
         Session: The agent session.
     """
-    current_session = None
+    current_session = cl.user_session.get('adk_session')
+    if current_session is not None:
+        return current_session
+
     try:
-        # Use the imported 'api' object to access the session service
-        session_service = FirebaseSessionService()
-        current_session = await session_service.get_session(user_id=user_id, session_id=session_id)
+        session_service = get_session_service()
+        current_session = await session_service.get_session(
+            app_name=os.getenv("APP_NAME"),
+            user_id=user_id,
+            session_id=session_id
+        )
     except AttributeError:
         logger.error("Session service not initialized.")
 
     if not current_session:
-        return await create_session(user_id=user_id)
+        current_session = await create_session(user_id=user_id)
+    if current_session is not None:
+        cl.user_session.set('adk_session', current_session)
+    return current_session
 
 
-async def get_agent_runner(user_id: str):
+@lru_cache(maxsize=1)
+def get_agent_runner() -> Runner:
     """Method use to get the agent runner.
 
-    Args:
-        user_id (str): The user id.
+    The runner holds no per-session state, so it's built once and shared by
+    every message instead of being rebuilt on each turn.
 
     Returns:
         Runner: The agent runner.
     """
-    session_service = FirebaseSessionService()
-    agent_session = await get_agent_session(
-        user_id=user_id,
-        session_id=cl.context.session.id
-    )
-
-    agent_runner = Runner(
-        # Instantiate FirebaseArtifactService and pass it to the runner
-        artifact_service=FirebaseArtifactService(
-            bucket_name=os.getenv("FIREBASE_STORAGE_BUCKET")
-        ),
-        # Pass the session service instance
+    return Runner(
+        artifact_service=get_artifact_service(),
         app_name=os.getenv("APP_NAME"),
         agent=coordinator,
-        session_service=session_service,
-        session=agent_session
+        session_service=get_session_service()
     )
 
-    return agent_runner
-
 @cl.oauth_callback
 def oauth_callback(
         provider_id: str,
@@ -143,19 +155,75 @@ async def on_message(message: cl.Message):
     if message.elements:
         content.parts.append(types.Part(text=f"\n arquivo anexado: {message.elements[0]}"))
 
-    agent_runner = await get_agent_runner(user_id=user_id)
-
-    async for event in agent_runner.run_async(user_id=user_id, new_message=content, session_id=cl.context.session.id):
-        if event.is_final_response() and event.content:
-            await cl.Message(content=event.content.parts[0].text).send()
-        elif event.is_error():
-            logger.error(f"Error: {event.error_details}")
-            await cl.Message(content=f"Error: {event.error_details}").send()
-
-    # Check if the agent state contains the mdx_report
-    if hasattr(agent_runner.session, 'state') and 'mdx_report' in agent_runner.session.state:
-        mdx_report = agent_runner.session.state['mdx_report']
-        if mdx_report:
-            # Display the mdx_report as a Chainlit Text element
-            await cl.Message(content="Here is the generated report:").send()
-            await cl.Text(content=mdx_report, name="Generated Report", display="side").send()
+    await get_agent_session(user_id=user_id, session_id=cl.context.session.id)
+    agent_runner = get_agent_runner()
+
+    # The cached session is a snapshot, so the report is read from the state
+    # changes carried by the events of this run
+    mdx_report = None
+
+    # Message being streamed, created on the first partial event
+    response = None
+    # Tokens are sent in bulk to spare a websocket message per token. They
+    # are streamed once enough characters are buffered, or as they arrive
+    # when the last update is older than STREAM_FLUSH_INTERVAL, which also
+    # sends the first token right away. Any other event streams the
+    # buffered tokens, so they aren't held while the agent calls its tools.
+    loop = asyncio.get_running_loop()
+    pending_tokens: list[str] = []
+    pending_size = 0
+    last_flush = float('-inf')
+    async for event in agent_runner.run_async(
+        user_id=user_id,
+        new_message=content,
+        session_id=cl.context.session.id,
+        run_config=STREAMING_RUN_CONFIG
+    ):
+        if 'mdx_report' in event.actions.state_delta:
+            mdx_report = event.actions.state_delta['mdx_report']
+        if event.partial and event.content and event.content.parts and event.content.parts[0].text:
+            if response is None:
+                response = cl.Message(content="")
+            pending_tokens.append(event.content.parts[0].text)
+            pending_size += len(event.content.parts[0].text)
+            if pending_size >= STREAM_FLUSH_SIZE or loop.time() - last_flush >= STREAM_FLUSH_INTERVAL:
+                await response.stream_token(''.join(pending_tokens))
+                pending_tokens.clear()
+                pending_size = 0
+                last_flush = loop.time()
+        elif event.is_final_response() and event.content:
+            if response is None:
+                await cl.Message(content=event.content.parts[0].text).send()
+            else:
+                # The final event carries the aggregated text, pending tokens included
+                pending_tokens.clear()
+                pending_size = 0
+                response.content = event.content.parts[0].text
+                await response.send()
+                response = None
+                last_flush = float('-inf')
+        else:
+            if response is not None and pending_tokens:
+                await response.stream_token(''.join(pending_tokens))
+                pending_tokens.clear()
+                pending_size = 0
+                last_flush = loop.time()
+            if event.error_message:
+                logger.error(f"Error: {event.error_message}")
+                if response is not None:
+                    # Ends the interrupted stream before reporting the error
+                    await response.send()
+                    response = None
+                    last_flush = float('-inf')
+                await cl.Message(content=f"Error: {event.error_message}").send()
+
+    if response is not None:
+        # The run ended without the final event of the streamed message
+        if pending_tokens:
+            await response.stream_token(''.join(pending_tokens))
+        await response.send()
+
+    if mdx_report:
+        # Display the mdx_report as a Chainlit Text element
+        await cl.Message(content="Here is the generated report:").send()
+        await cl.Text(content=mdx_report, name="Generated Report", display="side").send()
@@ -1,10 +1,20 @@
 import os
 import yaml
 import json
+from types import MappingProxyType
+
+# libyaml bindings are optional in PyYAML builds
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 
 class ConfigHandler:
     _instance = None
     _configs = {}
+    # Parsed files keyed by absolute path, along with their modification time
+    _file_cache: dict[str, tuple[float, MappingProxyType]] = {}
 
     def __new__(cls):
         if cls._instance is None:
@@ -22,19 +32,44 @@ class ConfigHandler:
         # Normalize the config_path to an absolute path
         config_path = os.path.abspath(config_path)
 
-        if not os.path.exists(config_path):
+        try:
+            mtime = os.stat(config_path).st_mtime
+        except FileNotFoundError:
             print(f"Warning: Config file not found for module '{module_name}' at '{config_path}'")
             self._configs[module_name] = {}
             return
 
-        with open(config_path, 'r') as f:
-            try:
-                config_data = yaml.safe_load(f)
-                self._configs[module_name] = config_data if config_data is not None else {}
-            except yaml.YAMLError as e:
-                print(f"Error loading config file for module '{module_name}' at '{config_path}': {e}")
-                self._configs[module_name] = {}
+        # The file is only parsed again when it was modified since the last load
+        cached = self._file_cache.get(config_path)
+        if cached is not None and cached[0] == mtime:
+            self._configs[module_name] = cached[1]
+            return
+
+        try:
+            # The loader decodes the bytes itself
+            with open(config_path, 'rb') as f:
+                config_data = yaml.load(f, Loader=_Loader)
+            # Shared by every instance, so it's exposed as read-only
+            config = MappingProxyType(config_data if config_data is not None else {})
+            self._file_cache[config_path] = (mtime, config)
+            self._configs[module_name] = config
+        except yaml.YAMLError as e:
+            print(f"Error loading config file for module '{module_name}' at '{config_path}': {e}")
+            self._configs[module_name] = {}
+
+    def reload_config(self, module_name, config_path):
+        """
+        Reloads the configuration of a module, discarding its parsed file.
+
+        Modified files are already picked up by load_config, this forces the
+        parsing regardless of the file modification time.
 
+        Args:
+            module_name (str): The name of the module.
+            config_path (str): The path to the configuration file.
+        """
+        self._file_cache.pop(os.path.abspath(config_path), None)
+        self.load_config(module_name, config_path)
 
     def get_config(self, module_name, key=None, default=None):
         """
@@ -48,7 +83,7 @@ class ConfigHandler:
         Returns:
             The configuration value or the default value if the key is not found.
         """
-        module_config: dict = self._configs.get(module_name, {})
+        module_config: MappingProxyType = self._configs.get(module_name, {})
 
         if key is None:
             return module_config
@@ -0,0 +1,25 @@
+"""This module provides the Firebase application shared by the Firebase services.
+
+Functions:
+    - ensure_firebase_app: Initializes the default Firebase application once per process.
+"""
+from functools import lru_cache
+
+import firebase_admin
+from firebase_admin import credentials
+
+
+@lru_cache(maxsize=1)
+def ensure_firebase_app() -> firebase_admin.App:
+    """Initializes the default Firebase application once per process.
+
+    The application may already be initialized at boot time with the
+    FIREBASE_CREDENTIALS service account, otherwise the Application Default
+    Credentials are used. Either way, the lookup only happens on the first call.
+
+    Returns:
+        firebase_admin.App: The default Firebase application.
+    """
+    if not firebase_admin._apps:
+        firebase_admin.initialize_app(credentials.ApplicationDefault())
+    return firebase_admin.get_app()
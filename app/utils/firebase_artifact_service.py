@@ -2,19 +2,26 @@
 
 Classes:
     - FirebaseArtifactService: A service that uses Firebase Storage for artifact storage.
+
+Variables:
+    - DOWNLOAD_CHUNK_SIZE: Size in bytes of the chunks read when downloading an artifact.
     - default_user_id: The default user id.
     - logger: Logger instance.
 """
+import asyncio
 import os
 import uuid
+from collections.abc import AsyncIterator
 from typing import Optional
 
-import firebase_admin
-from firebase_admin import credentials, storage
+from firebase_admin import storage
 from google.adk.artifacts import BaseArtifactService
 from google.genai.types import Part
 
-from app.utils.logger import Logger
+from app.utils.firebase_app import ensure_firebase_app
+from app.utils.logger import get_logger
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20
 
 
 class FirebaseArtifactService(BaseArtifactService):
@@ -26,14 +33,10 @@ class FirebaseArtifactService(BaseArtifactService):
         Args:
             bucket_name: The name of the Firebase Storage bucket.
         """
-        self.logger = Logger(__name__)
+        self.logger = get_logger(__name__)
         self.bucket_name = bucket_name
         try:
-            # Initialize Firebase if it hasn't been already
-            if not firebase_admin._apps:
-                cred = credentials.ApplicationDefault()
-                firebase_admin.initialize_app(cred)
-            self.bucket = storage.bucket(name=bucket_name)
+            self.bucket = storage.bucket(name=bucket_name, app=ensure_firebase_app())
         except Exception as e:
             self.logger.error(f"Error initializing Firebase Storage: {e}")
             self.bucket = None
@@ -64,10 +67,7 @@ class FirebaseArtifactService(BaseArtifactService):
             # overwrite if the key exists or create a new one.
             # If real versioning is needed, a different strategy would be required.
             blob_name = f"artifacts/{user_id}/{session_id}/{artifact_key}"
-            blob = self.bucket.blob(blob_name)
-
-            # Upload the artifact data (assuming artifact.data is bytes)
-            blob.upload_from_string(artifact.data, content_type=artifact.mime_type)
+            await self._upload_blob(blob_name, artifact.data, artifact.mime_type)
 
             self.logger.info(f"Artifact with key '{artifact_key}' saved successfully to '{blob_name}'.")
             return artifact_key
@@ -75,6 +75,18 @@ class FirebaseArtifactService(BaseArtifactService):
             self.logger.error(f"Error saving artifact with key '{artifact_key}': {e}")
             raise # Re-raise the exception
 
+    async def _upload_blob(self, blob_name: str, data: bytes, mime_type: str | None):
+        """Uploads data to a Firebase Storage blob.
+
+        Args:
+            blob_name: The name of the blob.
+            data: The data to upload.
+            mime_type: The content type of the data.
+        """
+        blob = self.bucket.blob(blob_name)
+        # The storage client is blocking, so the upload runs in a thread
+        await asyncio.to_thread(blob.upload_from_string, data, content_type=mime_type)
+
     async def load_artifact(self, user_id: str, session_id: str, artifact_key: str, version: str | None = None) -> Optional[Part]:
         """Loads an artifact from Firebase Storage.
 
@@ -103,8 +115,7 @@ class FirebaseArtifactService(BaseArtifactService):
         Returns:
             A list of artifact keys.
         """
-        artifacts = await self._list_artifacts_internal(user_id, session_id)
-        return [artifact.id for artifact in artifacts if artifact.id]
+        return await self._list_blob_names(user_id, session_id)
 
     async def upload_artifact(self, artifact: Optional[Part], user_id: str, session_id: str) -> str:
         """Uploads an artifact to Firebase Storage.
@@ -127,10 +138,7 @@ class FirebaseArtifactService(BaseArtifactService):
         # and a simple key/value storage like Firebase Storage.
         try:
             blob_name = f"artifacts/{user_id}/{session_id}/{artifact.id}"
-            blob = self.bucket.blob(blob_name)
-
-            # Upload the artifact data (assuming artifact.data is bytes)
-            blob.upload_from_string(artifact.data, content_type=artifact.mime_type)
+            await self._upload_blob(blob_name, artifact.data, artifact.mime_type)
 
             self.logger.info(f"Artifact '{artifact.id}' uploaded successfully to '{blob_name}'.")
             return artifact.id
@@ -138,8 +146,8 @@ class FirebaseArtifactService(BaseArtifactService):
             self.logger.error(f"Error uploading artifact '{artifact.id}': {e}")
             raise # Re-raise the exception
 
-    async def download_artifact(self, artifact_id: str, user_id: str, session_id: str) -> Optional[Part]:
-        """Downloads an artifact from Firebase Storage.
+    def _artifact_blob(self, artifact_id: str, user_id: str, session_id: str):
+        """Gets the blob of an artifact, raising if Firebase Storage isn't initialized.
 
         Args:
             artifact_id: The ID of the artifact (Firebase Storage blob name).
@@ -147,30 +155,88 @@ class FirebaseArtifactService(BaseArtifactService):
             session_id: The ID of the session.
 
         Returns:
-            The downloaded Artifact.
+            The artifact blob.
 
         Raises:
-            FileNotFoundError: If the artifact is not found.
-            Exception: If there's an error during download.
+            Exception: If Firebase Storage is not initialized.
         """
         if not self.bucket:
             self.logger.error("Firebase Storage not initialized. Cannot download artifact.")
             raise Exception("Firebase Storage not initialized.")
+        return self.bucket.blob(f"artifacts/{user_id}/{session_id}/{artifact_id}")
+
+    async def _iter_blob(self, blob) -> AsyncIterator[bytes]:
+        """Reads a blob in DOWNLOAD_CHUNK_SIZE chunks.
+
+        Args:
+            blob: The blob to read.
+
+        Yields:
+            The blob content, chunk by chunk.
+
+        Raises:
+            FileNotFoundError: If the blob is not found.
+        """
+        if not await asyncio.to_thread(blob.exists):
+            raise FileNotFoundError(f"Artifact not found at '{blob.name}'.")
+
+        reader = await asyncio.to_thread(blob.open, "rb", chunk_size=DOWNLOAD_CHUNK_SIZE)
+        try:
+            while chunk := await asyncio.to_thread(reader.read, DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+        finally:
+            reader.close()
+
+    async def iter_artifact(self, artifact_id: str, user_id: str, session_id: str) -> AsyncIterator[bytes]:
+        """Streams an artifact from Firebase Storage.
+
+        Only one chunk is held in memory at a time, so large artifacts can be
+        forwarded without being fully buffered.
 
+        Args:
+            artifact_id: The ID of the artifact (Firebase Storage blob name).
+            user_id: The ID of the user.
+            session_id: The ID of the session.
+
+        Yields:
+            The artifact content, chunk by chunk.
+
+        Raises:
+            FileNotFoundError: If the artifact is not found.
+            Exception: If there's an error during download.
+        """
+        blob = self._artifact_blob(artifact_id, user_id, session_id)
         try:
-            # Construct the blob name
-            blob_name = f"artifacts/{user_id}/{session_id}/{artifact_id}"
-            blob = self.bucket.blob(blob_name)
+            async for chunk in self._iter_blob(blob):
+                yield chunk
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Error downloading artifact '{artifact_id}': {e}")
+            raise # Re-raise the exception
 
-            if not blob.exists():
-                raise FileNotFoundError(f"Artifact '{artifact_id}' not found at '{blob_name}'.")
+    async def download_artifact(self, artifact_id: str, user_id: str, session_id: str) -> Optional[Part]:
+        """Downloads an artifact from Firebase Storage.
 
-            # Download the artifact data
-            artifact_data = blob.download_as_bytes()
-            # Assuming artifact.mime_type can be retrieved from metadata or inferred
+        Args:
+            artifact_id: The ID of the artifact (Firebase Storage blob name).
+            user_id: The ID of the user.
+            session_id: The ID of the session.
+
+        Returns:
+            The downloaded Artifact.
+
+        Raises:
+            FileNotFoundError: If the artifact is not found.
+            Exception: If there's an error during download.
+        """
+        blob = self._artifact_blob(artifact_id, user_id, session_id)
+        try:
+            artifact_data = b"".join([chunk async for chunk in self._iter_blob(blob)])
+            # The content type is read from the download response headers
             mime_type = blob.content_type or "application/octet-stream"
 
-            self.logger.info(f"Artifact '{artifact_id}' downloaded successfully from '{blob_name}'.")
+            self.logger.info(f"Artifact '{artifact_id}' downloaded successfully from '{blob.name}'.")
             return Part(data=artifact_data, mime_type=mime_type, id=artifact_id)
         except FileNotFoundError:
             raise
@@ -192,6 +258,31 @@ class FirebaseArtifactService(BaseArtifactService):
         # Keeping it for potential utility or if it was intended to be implemented.
         return await self._list_artifacts_internal(user_id, session_id)
 
+    async def _list_blob_names(self, user_id: str, session_id: str) -> list[str]:
+        """Lists the artifact keys of a session without downloading the artifacts.
+
+        Args:
+            user_id: The ID of the user.
+            session_id: The ID of the session.
+
+        Returns:
+            A list of artifact keys.
+        """
+        if not self.bucket:
+            self.logger.error("Firebase Storage not initialized. Cannot list artifacts.")
+            return []
+
+        try:
+            prefix = f"artifacts/{user_id}/{session_id}/"
+            # Only the names are requested, keeping the listing responses small
+            blobs = await asyncio.to_thread(
+                lambda: list(self.bucket.list_blobs(prefix=prefix, fields="items(name),nextPageToken"))
+            )
+            return [os.path.basename(blob.name) for blob in blobs]
+        except Exception as e:
+            self.logger.error(f"Error listing artifact keys for session '{session_id}': {e}")
+            return []
+
     async def _list_artifacts_internal(self, user_id: str, session_id: str) -> list[Optional[Part]]:
         """Lists artifacts for a session in Firebase Storage.
 
@@ -206,19 +297,20 @@ class FirebaseArtifactService(BaseArtifactService):
             self.logger.error("Firebase Storage not initialized. Cannot list artifacts.")
             return []
 
+        async def download(blob) -> Optional[Part]:
+            # Extract artifact ID from blob name
+            artifact_id = os.path.basename(blob.name)
+            # Artifacts may be binary, so they're not decoded
+            blob_data = await asyncio.to_thread(blob.download_as_bytes)
+            return Part(id=artifact_id, data=blob_data, mime_type=blob.content_type)
+
         try:
             # List blobs in the session's artifact folder
             prefix = f"artifacts/{user_id}/{session_id}/"
-            blobs = self.bucket.list_blobs(prefix=prefix)
+            blobs = await asyncio.to_thread(lambda: list(self.bucket.list_blobs(prefix=prefix)))
 
-            artifacts: list[Optional[Part]] = []
-            for blob in blobs:
-                # Extract artifact ID from blob name
-                artifact_id = os.path.basename(blob.name)
-                # We can't download the full data here for performance, so create Artifacts with basic info
-                # You might need to modify this based on how Artifact is used by the ADK
-                blob_data = blob.download_as_text()
-                artifacts.append(Part(id=artifact_id, data=blob_data, mime_type=blob.content_type))
+            # The storage client is blocking, so the downloads run concurrently in threads
+            artifacts: list[Optional[Part]] = list(await asyncio.gather(*(download(blob) for blob in blobs)))
 
             self.logger.info(f"Listed {len(artifacts)} artifacts for session '{session_id}'.")
             return artifacts
@@ -226,6 +318,28 @@ class FirebaseArtifactService(BaseArtifactService):
             self.logger.error(f"Error listing artifacts for session '{session_id}': {e}")
             return []
 
+    async def delete_artifact(self, *, app_name: str, user_id: str, session_id: str, filename: str):
+        """Deletes an artifact from Firebase Storage.
+
+        Args:
+            app_name: The name of the application. Unused, the artifacts are
+                stored by user and session.
+            user_id: The ID of the user.
+            session_id: The ID of the session.
+            filename: The key of the artifact.
+        """
+        if not self.bucket:
+            self.logger.error("Firebase Storage not initialized. Cannot delete artifact.")
+            return
+
+        try:
+            blob_name = f"artifacts/{user_id}/{session_id}/{filename}"
+            await asyncio.to_thread(self.bucket.blob(blob_name).delete)
+            self.logger.info(f"Artifact '{filename}' deleted from '{blob_name}'.")
+        except Exception as e:
+            self.logger.error(f"Error deleting artifact '{filename}': {e}")
+            raise # Re-raise the exception
+
     async def list_versions(self, user_id: str, session_id: str, artifact_key: str) -> list[str]:
         """Lists versions for a specific artifact key.
 
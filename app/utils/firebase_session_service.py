@@ -2,62 +2,135 @@
 
 Classes:
     - FirebaseSessionService: A session service that uses Google Firestore for session storage.
+
+Functions:
+    - get_firestore_client: Gets the Firestore client shared by the session services.
+
+Variables:
+    - MAX_BATCH_SIZE: Maximum number of operations in a Firestore write batch.
+    - SESSION_CACHE_TTL: Seconds during which a read session is served from memory.
+    - SESSION_CACHE_SIZE: Maximum number of sessions kept in memory.
 """
-import firebase_admin
-from firebase_admin import credentials, firestore
+import asyncio
+import copy
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any
+
+from firebase_admin import firestore_async
 from google.adk.events import Event
 from google.adk.sessions import BaseSessionService
+from google.cloud.firestore_v1 import SERVER_TIMESTAMP
 from google.cloud.firestore_v1.base_document import DocumentSnapshot
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from app.utils.firebase_app import ensure_firebase_app
+from app.utils.logger import get_logger
+
+MAX_BATCH_SIZE = 500
+SESSION_CACHE_TTL = 30
+SESSION_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=1)
+def get_firestore_client():
+    """Gets the Firestore client shared by the session services.
 
-from app.utils.logger import Logger
+    The client is only built on the first call and cached for the process
+    lifetime, so the gRPC stack isn't set up at boot time nor per service.
+    It's the asyncio client, so the Firestore calls don't block the event loop.
+
+    Returns:
+        firestore.AsyncClient: The Firestore client.
+    """
+    return firestore_async.client(ensure_firebase_app())
 
 
 class FirebaseSessionService(BaseSessionService):
     """A session service that uses Google Firestore for session storage."""
 
-    def __init__(self, collection_name="sessions"):
+    def __init__(self, collection_name="sessions", client_factory=get_firestore_client):
         """Initializes the FirebaseSessionService.
 
         Args:
             collection_name (str): The name of the Firestore collection to use
                                    for sessions. Defaults to 'sessions'.
+            client_factory (Callable): Getter of the Firestore client, called on
+                                       first use. Defaults to get_firestore_client.
         """
-        self.logger = Logger(__name__)
+        self.logger = get_logger(__name__)
         self.collection_name = collection_name
-        try:
-            # Initialize Firebase if it hasn't been already
-            if not firebase_admin._apps:
-                cred = credentials.ApplicationDefault()
-                firebase_admin.initialize_app(cred)
-            self.db = firestore.client()
-        except Exception as e:
-            self.logger.error(f"Error initializing Firebase: {e}")
-            self.db = None
-
-    async def create_session(self, user_id: str, session_id: str, data: dict):
+        self._client_factory = client_factory
+        self._db = None
+        self._collection_ref = None
+        # Recently read sessions, as (read time, data), dropped on any write
+        self._cache: dict[tuple[str, str], tuple[float, dict]] = {}
+        # Bumped around every write, a read spanning a write isn't cached
+        self._write_generation = 0
+
+    @property
+    def db(self):
+        """The Firestore client, lazily built on first read or write.
+
+        Returns:
+            firestore.AsyncClient or None: The client, or None if Firebase could not be initialized.
+        """
+        if self._db is None:
+            try:
+                self._db = self._client_factory()
+            except Exception:
+                self.logger.exception("Error initializing Firebase")
+        return self._db
+
+    @property
+    def _collection(self):
+        """The sessions collection reference, built once the client is available.
+
+        Returns:
+            firestore.AsyncCollectionReference: The sessions collection.
+        """
+        if self._collection_ref is None:
+            self._collection_ref = self.db.collection(self.collection_name)
+        return self._collection_ref
+
+    async def create_session(self, user_id: str, session_id: str, data: dict | None = None, app_name: str | None = None):
         """Creates a new session document in Firestore.
 
         Args:
             session_id (str): The ID of the session.
-            data (dict): The data to store in the session document.
+            data (dict, optional): The data to store in the session document. Defaults to an empty document.
+            app_name (str, optional): The application name. Sessions are scoped by
+                                      collection, so it isn't part of the document ID.
         """
         if not self.db:
             self.logger.error("Firestore not initialized. Cannot create session.")
             return
 
         try:
-            doc_ref = self.db.collection(self.collection_name).document(f"{user_id}:{session_id}")
-            doc_ref.set(data)
-            self.logger.info(f"Session '{session_id}' created successfully.")
-        except Exception as e:
-            self.logger.error(f"Error creating session '{session_id}': {e}")
+            doc_ref = self._get_session_doc_ref(user_id, session_id)
+            # The owner is stored as a field so the user sessions can be queried
+            with self._writing(user_id, [session_id]):
+                await doc_ref.set({**(data or {}), 'user_id': user_id})
+            self.logger.info("Session '%s' created successfully.", session_id)
+        except Exception:
+            self.logger.exception("Error creating session '%s'", session_id)
             raise # Re-raise the exception to be handled by the caller
 
-    async def get_session(self, user_id: str, session_id: str) -> dict | None:
+    async def get_session(self, user_id: str, session_id: str, app_name: str | None = None, fields: list[str] | None = None) -> dict | None:
         """Retrieves a session document from Firestore.
 
+        Sessions read in the last SESSION_CACHE_TTL seconds are served from
+        memory, the writes made through this service drop them right away.
+
         Args:
             session_id (str): The ID of the session.
+            app_name (str, optional): The application name. Sessions are scoped by
+                                      collection, so it isn't part of the document ID.
+            fields (list[str], optional): Field paths to retrieve, the others are left
+                                          out of the response. Projected reads always go
+                                          to Firestore. Defaults to the whole document.
 
         Returns:
             dict or None: The session data as a dictionary if found, otherwise None.
@@ -66,17 +139,33 @@ class FirebaseSessionService(BaseSessionService):
             self.logger.error("Firestore not initialized. Cannot get session.")
             return None
 
+        cached = self._cache.get((user_id, session_id))
+        if not fields and cached is not None and time.monotonic() - cached[0] < SESSION_CACHE_TTL:
+            # Callers get their own copy, the cached data must not change
+            return copy.deepcopy(cached[1])
+
+        generation = self._write_generation
         try:
-            doc_ref = self.db.collection(self.collection_name).document(f"{user_id}:{session_id}")
-            doc: DocumentSnapshot = doc_ref.get()
+            doc_ref = self._get_session_doc_ref(user_id, session_id)
+            doc: DocumentSnapshot = await doc_ref.get(field_paths=fields or None)
             if doc.exists:
-                self.logger.info(f"Session '{session_id}' retrieved successfully.")
-                return doc.to_dict()
+                self.logger.info("Session '%s' retrieved successfully.", session_id)
+                data = doc.to_dict()
+                if fields:
+                    return data
+                # The document may predate a write made during the read
+                if generation == self._write_generation:
+                    self._cache.pop((user_id, session_id), None)
+                    self._cache[(user_id, session_id)] = (time.monotonic(), data)
+                    if len(self._cache) > SESSION_CACHE_SIZE:
+                        # The oldest read comes first
+                        del self._cache[next(iter(self._cache))]
+                return copy.deepcopy(data)
             else:
-                self.logger.info(f"Session '{session_id}' not found.")
+                self.logger.info("Session '%s' not found.", session_id)
                 return None
-        except Exception as e:
-            self.logger.error(f"Error getting session '{session_id}': {e}")
+        except Exception:
+            self.logger.exception("Error getting session '%s'", session_id)
             raise # Re-raise the exception to be handled by the caller
 
     async def update_session(self, user_id: str, session_id: str, data: dict):
@@ -91,11 +180,36 @@ class FirebaseSessionService(BaseSessionService):
             return
 
         try:
-            doc_ref = self.db.collection(self.collection_name).document(f"{user_id}:{session_id}")
-            doc_ref.update(data)
-            self.logger.info(f"Session '{session_id}' updated successfully.")
-        except Exception as e:
-            self.logger.error(f"Error updating session '{session_id}': {e}")
+            doc_ref = self._get_session_doc_ref(user_id, session_id)
+            with self._writing(user_id, [session_id]):
+                await doc_ref.update(data)
+            self.logger.info("Session '%s' updated successfully.", session_id)
+        except Exception:
+            self.logger.exception("Error updating session '%s'", session_id)
+            raise # Re-raise the exception to be handled by the caller
+
+    async def upsert_session(self, user_id: str, session_id: str, data: dict):
+        """Creates a session document, or merges the data into the existing one.
+
+        A single write replaces the read needed to choose between create_session
+        and update_session. The fields not present in data are preserved, and
+        updated_at is set to the Firestore server time.
+
+        Args:
+            session_id (str): The ID of the session.
+            data (dict): The data to store in the session document.
+        """
+        if not self.db:
+            self.logger.error("Firestore not initialized. Cannot upsert session.")
+            return
+
+        try:
+            doc_ref = self._get_session_doc_ref(user_id, session_id)
+            with self._writing(user_id, [session_id]):
+                await doc_ref.set({**data, 'user_id': user_id, 'updated_at': SERVER_TIMESTAMP}, merge=True)
+            self.logger.info("Session '%s' upserted successfully.", session_id)
+        except Exception:
+            self.logger.exception("Error upserting session '%s'", session_id)
             raise # Re-raise the exception to be handled by the caller
 
     async def delete_session(self, user_id: str, session_id: str):
@@ -109,19 +223,134 @@ class FirebaseSessionService(BaseSessionService):
             return
 
         try:
-            doc_ref = self.db.collection(self.collection_name).document(f"{user_id}:{session_id}")
-            doc_ref.delete()
-            self.logger.info(f"Session '{session_id}' deleted successfully.")
-        except Exception as e:
-            self.logger.error(f"Error deleting session '{session_id}': {e}")
+            doc_ref = self._get_session_doc_ref(user_id, session_id)
+            with self._writing(user_id, [session_id]):
+                await doc_ref.delete()
+            self.logger.info("Session '%s' deleted successfully.", session_id)
+        except Exception:
+            self.logger.exception("Error deleting session '%s'", session_id)
             raise # Re-raise the exception to be handled by the caller
 
-    async def _get_session_doc_ref(self, user_id: str, session_id: str):
+    def _invalidate(self, user_id: str, session_ids: Iterable[str]):
+        """Drops sessions from the read cache.
+
+        Args:
+            user_id: The ID of the user owning the sessions.
+            session_ids: The IDs of the sessions to drop.
+        """
+        self._write_generation += 1
+        for session_id in session_ids:
+            self._cache.pop((user_id, session_id), None)
+
+    @contextmanager
+    def _writing(self, user_id: str, session_ids: Iterable[str]):
+        """Drops sessions from the read cache before and after writing them.
+
+        The second drop also covers the reads started while the write was in
+        flight, which may have fetched the previous document.
+
+        Args:
+            user_id: The ID of the user owning the sessions.
+            session_ids: The IDs of the sessions being written.
+        """
+        session_ids = list(session_ids)
+        self._invalidate(user_id, session_ids)
+        try:
+            yield
+        finally:
+            self._invalidate(user_id, session_ids)
+
+    async def _write_in_batches(self, items: Iterable[Any], write: Callable[[Any, Any], None]):
+        """Writes items through Firestore write batches, committed concurrently.
+
+        Args:
+            items: The items to write.
+            write: Adds the write of an item to a batch, called as write(batch, item).
+        """
+        items = list(items)
+        batches = []
+        # A write batch is limited to MAX_BATCH_SIZE operations
+        for start in range(0, len(items), MAX_BATCH_SIZE):
+            batch = self.db.batch()
+            for item in items[start:start + MAX_BATCH_SIZE]:
+                write(batch, item)
+            batches.append(batch)
+        await asyncio.gather(*(batch.commit() for batch in batches))
+
+    async def create_sessions(self, user_id: str, sessions: dict[str, dict]):
+        """Creates several session documents, in as few writes as possible.
+
+        Args:
+            user_id (str): The ID of the user owning the sessions.
+            sessions (dict): The data to store, by session ID.
+        """
+        if not self.db:
+            self.logger.error("Firestore not initialized. Cannot create sessions.")
+            return
+
+        try:
+            with self._writing(user_id, sessions):
+                await self._write_in_batches(
+                    sessions.items(),
+                    lambda batch, item: batch.set(
+                        self._get_session_doc_ref(user_id, item[0]), {**item[1], 'user_id': user_id}
+                    )
+                )
+            self.logger.info("%s sessions created for user '%s'.", len(sessions), user_id)
+        except Exception:
+            self.logger.exception("Error creating sessions for user '%s'", user_id)
+            raise # Re-raise the exception to be handled by the caller
+
+    async def update_sessions(self, user_id: str, sessions: dict[str, dict]):
+        """Updates several session documents, in as few writes as possible.
+
+        Args:
+            user_id (str): The ID of the user owning the sessions.
+            sessions (dict): The data to update, by session ID.
+        """
+        if not self.db:
+            self.logger.error("Firestore not initialized. Cannot update sessions.")
+            return
+
+        try:
+            with self._writing(user_id, sessions):
+                await self._write_in_batches(
+                    sessions.items(),
+                    lambda batch, item: batch.update(self._get_session_doc_ref(user_id, item[0]), item[1])
+                )
+            self.logger.info("%s sessions updated for user '%s'.", len(sessions), user_id)
+        except Exception:
+            self.logger.exception("Error updating sessions for user '%s'", user_id)
+            raise # Re-raise the exception to be handled by the caller
+
+    async def delete_sessions(self, user_id: str, session_ids: list[str]):
+        """Deletes several session documents, in as few writes as possible.
+
+        Args:
+            user_id (str): The ID of the user owning the sessions.
+            session_ids (list): The IDs of the sessions to delete.
+        """
+        if not self.db:
+            self.logger.error("Firestore not initialized. Cannot delete sessions.")
+            return
+
+        try:
+            with self._writing(user_id, session_ids):
+                await self._write_in_batches(
+                    session_ids,
+                    lambda batch, session_id: batch.delete(self._get_session_doc_ref(user_id, session_id))
+                )
+            self.logger.info("%s sessions deleted for user '%s'.", len(session_ids), user_id)
+        except Exception:
+            self.logger.exception("Error deleting sessions for user '%s'", user_id)
+            raise # Re-raise the exception to be handled by the caller
+
+    def _get_session_doc_ref(self, user_id: str, session_id: str):
         """Gets the document reference for a session."""
         if not self.db:
             self.logger.error("Firestore not initialized. Cannot get document reference.")
             return None
-        return self.db.collection(self.collection_name).document(f"{user_id}:{session_id}")
+        return self._collection.document(f"{user_id}:{session_id}")
 
     async def append_event(self, user_id: str, session_id: str, event: Event):
         """Appends a session event.
@@ -136,45 +365,86 @@ class FirebaseSessionService(BaseSessionService):
             return
 
         try:
-            session_doc_ref = await self._get_session_doc_ref(user_id, session_id)
+            session_doc_ref = self._get_session_doc_ref(user_id, session_id)
             if session_doc_ref:
                 events_collection_ref = session_doc_ref.collection("events")
-                # You might want to add a timestamp or a unique ID to the event data
-                event_data = event.model_dump() # Assuming Event is a Pydantic model
+                # Unset optional fields are left out, the defaults are restored on load
+                event_data = event.model_dump(exclude_none=True)
                 await events_collection_ref.add(event_data)
-                self.logger.info(f"Event appended to session '{session_id}'.")
+                self.logger.info("Event appended to session '%s'.", session_id)
             else:
-                self.logger.warning(f"Session document for '{session_id}' not found. Cannot append event.")
-        except Exception as e:
-            self.logger.error(f"Error appending event to session '{session_id}': {e}")
+                self.logger.warning("Session document for '%s' not found. Cannot append event.", session_id)
+        except Exception:
+            self.logger.exception("Error appending event to session '%s'", session_id)
             raise # Re-raise the exception to be handled by the caller
 
-    async def list_events(self, user_id: str, session_id: str) -> list[Event]:
-        """Lists session events.
+    async def append_events(self, user_id: str, session_id: str, events: list[Event]):
+        """Appends several session events, in as few writes as possible.
 
-        Returns:
-            A list of Event objects.
+        Args:
+            user_id: The user ID.
+            session_id: The session ID.
+            events: The session events to append.
         """
         if not self.db:
-            self.logger.error("Firestore not initialized. Cannot list events.")
-            return []
+            self.logger.error("Firestore not initialized. Cannot append events.")
+            return
 
         try:
-            session_doc_ref = await self._get_session_doc_ref(user_id, session_id)
+            session_doc_ref = self._get_session_doc_ref(user_id, session_id)
             if session_doc_ref:
                 events_collection_ref = session_doc_ref.collection("events")
-                events_docs = await events_collection_ref.get()
+                await self._write_in_batches(
+                    events,
+                    lambda batch, event: batch.set(events_collection_ref.document(), event.model_dump(exclude_none=True))
+                )
+                self.logger.info("%s events appended to session '%s'.", len(events), session_id)
+            else:
+                self.logger.warning("Session document for '%s' not found. Cannot append events.", session_id)
+        except Exception:
+            self.logger.exception("Error appending events to session '%s'", session_id)
+            raise # Re-raise the exception to be handled by the caller
+
+    async def iter_events(self, user_id: str, session_id: str) -> AsyncIterator[Event]:
+        """Iterates over the session events in chronological order.
+
+        The events are streamed from Firestore, so only the documents being
+        read are held in memory.
+
+        Args:
+            user_id: The user ID.
+            session_id: The session ID.
+
+        Yields:
+            The session events, oldest first.
+        """
+        if not self.db:
+            self.logger.error("Firestore not initialized. Cannot list events.")
+            return
+
+        try:
+            session_doc_ref = self._get_session_doc_ref(user_id, session_id)
+            if session_doc_ref:
+                events_query = session_doc_ref.collection("events").order_by("timestamp")
                 # Convert Firestore documents to Event objects
-                session_events = [Event(**doc.to_dict()) for doc in events_docs]
-                self.logger.info(f"Listed {len(session_events)} events for session '{session_id}'.")
-                return session_events
+                async for doc in events_query.stream():
+                    yield Event(**doc.to_dict())
             else:
-                self.logger.warning(f"Session document for '{session_id}' not found. Cannot list events.")
-                return []
-        except Exception as e:
-            self.logger.error(f"Error listing events for session '{session_id}': {e}")
+                self.logger.warning("Session document for '%s' not found. Cannot list events.", session_id)
+        except Exception:
+            self.logger.exception("Error listing events for session '%s'", session_id)
             raise # Re-raise the exception to be handled by the caller
 
+    async def list_events(self, user_id: str, session_id: str) -> list[Event]:
+        """Lists session events.
+
+        Returns:
+            A list of Event objects, oldest first.
+        """
+        session_events = [event async for event in self.iter_events(user_id, session_id)]
+        self.logger.info("Listed %s events for session '%s'.", len(session_events), session_id)
+        return session_events
+
     async def list_sessions(self, user_id: str) -> list[dict]:
         """Lists sessions for a user.
 
@@ -186,13 +456,12 @@ class FirebaseSessionService(BaseSessionService):
             return []
 
         try:
-            # Query for documents where the document ID starts with user_id
-            sessions_query = self.db.collection(self.collection_name).where(firestore.FieldPath.document_id(), ">=", user_id + ":").where(firestore.FieldPath.document_id(), "<", user_id + ";")
-            sessions_docs = await sessions_query.get()
+            sessions_query = self._collection.where(filter=FieldFilter('user_id', '==', user_id))
+            sessions_docs = [doc async for doc in sessions_query.stream()]
             # Convert Firestore documents to dictionaries
             session_list = [doc.to_dict() for doc in sessions_docs]
-            self.logger.info(f"Listed {len(session_list)} sessions for user '{user_id}'.")
+            self.logger.info("Listed %s sessions for user '%s'.", len(session_list), user_id)
             return session_list
-        except Exception as e:
-            self.logger.error(f"Error listing sessions for user '{user_id}': {e}")
+        except Exception:
+            self.logger.exception("Error listing sessions for user '%s'", user_id)
             raise # Re-raise the exception to be handled by the caller
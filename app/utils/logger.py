@@ -1,40 +1,62 @@
-import inspect
 import logging
+import sys
+from functools import cache, lru_cache
 
 from app.utils.config_handler import ConfigHandler
 
 
+@lru_cache(maxsize=1)
+def _get_log_settings():
+    """Reads the logging level and format from the configuration, once per process.
+
+    Returns:
+        tuple: The logging level as an int and the log format.
+    """
+    config_handler = ConfigHandler()
+    log_level = config_handler.get_config("logging", "level", default="INFO").upper()
+    log_format = config_handler.get_config("logging", "format", default="%(asctime)s - %(name)s - [%(context)s] %(levelname)s - %(message)s")
+    return getattr(logging, log_level, logging.INFO), log_format
+
+
+class _ContextFilter(logging.Filter):
+    """Gives an empty context to the records not logged through Logger."""
+
+    def filter(self, record):
+        if not hasattr(record, 'context'):
+            record.context = ''
+        return True
+
+
+@lru_cache(maxsize=1)
+def _configure_logging():
+    """Sets up the application handler with the configured format, once per process.
+
+    The handler is attached to the top-level package logger, so the records
+    of every application module go through a single formatter, which renders
+    the call site context. They don't propagate to the root handler the
+    application server may have installed, so they're only printed once.
+    """
+    _, log_format = _get_log_settings()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter(log_format))
+    handler.addFilter(_ContextFilter())
+
+    app_logger = logging.getLogger(__name__.split('.')[0])
+    app_logger.addHandler(handler)
+    app_logger.propagate = False
+
+
 class Logger:
-    def __init__(self, name=None):
-        self._logger = logging.getLogger(name if name else self._get_calling_module_name())
+    def __init__(self, name: str):
+        self._logger = logging.getLogger(name)
         self._configure_logger()
 
-    def _get_calling_module_name(self):
-        frame = inspect.currentframe()
-        if frame is None:
-            return __name__
-        outer_frames = inspect.getouterframes(frame, 2)
-        if len(outer_frames) > 2:
-            # The third frame (index 2) is the one calling Logger()
-            calling_frame = outer_frames[2]
-            return inspect.getmodule(calling_frame[0]).__name__
-        return __name__
-
     def _configure_logger(self):
-        config_handler = ConfigHandler()  # Assuming ConfigHandler is initialized elsewhere or handles its own instance
-        log_level = config_handler.get_config("logging", "level", default="INFO").upper()
-        log_format = config_handler.get_config("logging", "format", default="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
-
-        level = getattr(logging, log_level, logging.INFO)
+        level, _ = _get_log_settings()
+        _configure_logging()
+        # Records are emitted by the application handler, through propagation
         self._logger.setLevel(level)
 
-        # Avoid adding duplicate handlers if the logger is already configured
-        if not self._logger.handlers:
-            handler = logging.StreamHandler()
-            formatter = logging.Formatter(log_format)
-            handler.setFormatter(formatter)
-            self._logger.addHandler(handler)
-
     def debug(self, message, *args, **kwargs):
         self._log_with_context(logging.DEBUG, message, *args, **kwargs)
 
@@ -54,26 +76,32 @@ class Logger:
         self._log_with_context(logging.ERROR, message, exc_info=True, *args, **kwargs)
 
     def _log_with_context(self, level, message, *args, **kwargs):
-        frame = inspect.currentframe()
-        if frame is None:
-            self._logger.log(level, message, *args, **kwargs)
+        # Disabled levels skip both the frame lookup and the message formatting
+        if not self._logger.isEnabledFor(level):
             return
 
-        outer_frames = inspect.getouterframes(frame, 2)
-        # The third frame (index 2) is the one calling the log method (e.g., info, debug)
-        if len(outer_frames) > 2:
-            calling_frame = outer_frames[2]
-            class_name = None
-            method_name = calling_frame[3]  # Function/method name
-
-            # Attempt to get the class name if inside a method
-            if 'self' in calling_frame[0].f_locals:
-                class_name = calling_frame[0].f_locals['self'].__class__.__name__
-            elif 'cls' in calling_frame[0].f_locals:
-                class_name = calling_frame[0].f_locals['cls'].__name__
-
-            context = f"{class_name}.{method_name}" if class_name else method_name
-            full_message = f"[{context}] {message}"
-            self._logger.log(level, full_message, *args, **kwargs)
-        else:
-            self._logger.log(level, message, *args, **kwargs)
+        try:
+            # The third frame (index 2) is the one calling the log method (e.g., info, debug)
+            calling_frame = sys._getframe(2)
+        except (AttributeError, ValueError):
+            # sys._getframe is CPython specific, and the stack may be shallower
+            calling_frame = None
+
+        # The qualified name already holds the class of methods, e.g. Class.method
+        context = calling_frame.f_code.co_qualname if calling_frame is not None else ''
+        # The context is rendered by the formatter, only for the emitted records
+        extra = {**kwargs.pop('extra', {}), 'context': context}
+        self._logger.log(level, message, *args, extra=extra, **kwargs)
+
+
+@cache
+def get_logger(name):
+    """Gets the Logger of a module, built and configured once per name.
+
+    Args:
+        name (str): The name of the logger, usually the module __name__.
+
+    Returns:
+        Logger: The logger instance.
+    """
+    return Logger(name)
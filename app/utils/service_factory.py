@@ -0,0 +1,85 @@
+"""This module builds the session and artifact services for the selected backend.
+
+The backend is selected by the SESSION_BACKEND environment variable:
+    - firebase: Firestore sessions and Firebase Storage artifacts (default).
+    - memory: ADK in-memory sessions and artifacts, mostly for local development.
+
+The Firebase modules are only imported when the firebase backend is selected,
+so the other backends don't pay for loading the Firebase Admin SDK.
+
+Functions:
+    - make_session_service: Builds the session service for the selected backend.
+    - make_artifact_service: Builds the artifact service for the selected backend.
+    - get_session_service: Gets the session service shared by the application.
+    - get_artifact_service: Gets the artifact service shared by the application.
+
+Variables:
+    - SESSION_BACKEND: The selected backend.
+"""
+import os
+from functools import lru_cache
+
+from google.adk.artifacts import BaseArtifactService, InMemoryArtifactService
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "firebase")
+
+
+def make_session_service() -> BaseSessionService:
+    """Builds the session service for the selected backend.
+
+    Returns:
+        BaseSessionService: The session service.
+
+    Raises:
+        ValueError: If the selected backend is not supported.
+    """
+    if SESSION_BACKEND == "firebase":
+        from app.utils.firebase_session_service import FirebaseSessionService
+
+        return FirebaseSessionService()
+    if SESSION_BACKEND == "memory":
+        return InMemorySessionService()
+    raise ValueError(f"Unsupported session backend: '{SESSION_BACKEND}'")
+
+
+def make_artifact_service() -> BaseArtifactService:
+    """Builds the artifact service for the selected backend.
+
+    Returns:
+        BaseArtifactService: The artifact service.
+
+    Raises:
+        ValueError: If the selected backend is not supported.
+    """
+    if SESSION_BACKEND == "firebase":
+        from app.utils.firebase_artifact_service import FirebaseArtifactService
+
+        return FirebaseArtifactService(bucket_name=os.getenv("FIREBASE_STORAGE_BUCKET"))
+    if SESSION_BACKEND == "memory":
+        return InMemoryArtifactService()
+    raise ValueError(f"Unsupported session backend: '{SESSION_BACKEND}'")
+
+
+@lru_cache(maxsize=1)
+def get_session_service() -> BaseSessionService:
+    """Gets the session service shared by the application.
+
+    The service holds the backend client (and, for the memory backend, the
+    sessions themselves), so a single instance is built and reused by every
+    request.
+
+    Returns:
+        BaseSessionService: The session service.
+    """
+    return make_session_service()
+
+
+@lru_cache(maxsize=1)
+def get_artifact_service() -> BaseArtifactService:
+    """Gets the artifact service shared by the application.
+
+    Returns:
+        BaseArtifactService: The artifact service.
+    """
+    return make_artifact_service()